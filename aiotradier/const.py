@@ -30,8 +30,43 @@ API_COMPANY: Final[str] = "company"
 API_CALENDAR: Final[str] = "calendar"
 API_GAINLOSS: Final[str] = "gainloss"
 
+PATH_USER_PROFILE: Final[str] = f"{API_V1}/{API_USER}/{API_PROFILE}"
+PATH_ACCOUNTS: Final[str] = f"{API_V1}/{API_ACCOUNTS}"
+PATH_QUOTES: Final[str] = f"{API_V1}/{API_MARKETS}/{API_QUOTES}"
+PATH_OPTION_EXPIRATIONS: Final[str] = (
+    f"{API_V1}/{API_MARKETS}/{API_OPTIONS}/{API_EXPIRATIONS}"
+)
+PATH_OPTION_STRIKES: Final[str] = f"{API_V1}/{API_MARKETS}/{API_OPTIONS}/{API_STRIKES}"
+PATH_OPTION_CHAINS: Final[str] = f"{API_V1}/{API_MARKETS}/{API_OPTIONS}/{API_CHAINS}"
+PATH_HISTORICAL_QUOTES: Final[str] = f"{API_V1}/{API_MARKETS}/{API_HISTORY}"
+PATH_TIMESALES: Final[str] = f"{API_V1}/{API_MARKETS}/{API_TIMESALES}"
+PATH_CLOCK: Final[str] = f"{API_V1}/{API_MARKETS}/{API_CLOCK}"
+PATH_CALENDAR: Final[str] = f"{API_V1}/{API_MARKETS}/{API_CALENDAR}"
+PATH_SEARCH: Final[str] = f"{API_V1}/{API_MARKETS}/{API_SEARCH}"
+PATH_LOOKUP: Final[str] = f"{API_V1}/{API_MARKETS}/{API_LOOKUP}"
+PATH_COMPANY: Final[str] = f"{API_BETA}/{API_MARKETS}/{API_FUNDAMENTALS}/{API_COMPANY}"
+PATH_CALENDARS: Final[str] = (
+    f"{API_BETA}/{API_MARKETS}/{API_FUNDAMENTALS}/{API_CALENDARS}"
+)
+PATH_DIVIDENDS: Final[str] = (
+    f"{API_BETA}/{API_MARKETS}/{API_FUNDAMENTALS}/{API_DIVIDENDS}"
+)
+
 HTTP_CALL_TIMEOUT: Final[int] = 45
+HTTP_CONNECT_TIMEOUT: Final[int] = 10
+HTTP_READ_TIMEOUT: Final[int] = 30
 HTTP_MAX_REQUESTS: Final[int] = 4
+HTTP_KEEPALIVE_TIMEOUT: Final[int] = 75
+HTTP_DNS_CACHE_TTL: Final[int] = 300
+HTTP_MAX_RETRIES: Final[int] = 3
+HTTP_RETRY_BACKOFF: Final[float] = 1.0
+HTTP_THROTTLE_RECOVERY: Final[int] = 20
+
+CACHE_MAX_ENTRIES: Final[int] = 256
+JSON_THREAD_THRESHOLD: Final[int] = 256 * 1024
+
+QUOTE_BATCH_DELAY: Final[float] = 0.005
+QUOTE_BATCH_SIZE: Final[int] = 100
 
 RAW_USER_PROFILE: Final[str] = "user_profile"
 RAW_BALANCES: Final[str] = "balances"
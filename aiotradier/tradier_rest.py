@@ -1,11 +1,40 @@
 """Provide AsyncIO access to Tradier API"""
 
+import asyncio
 import logging
+import math
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
 from datetime import date, datetime
-import json
+from functools import partial
+from pathlib import Path
+from types import MappingProxyType
 from typing import Any, cast
-from aiohttp import ClientConnectorError, ClientResponseError, ClientSession
+from aiohttp import (
+    ClientConnectorError,
+    ClientResponse,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+)
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # orjson is an optional speedup, fall back to the stdlib
+    import json as orjson  # type: ignore[no-redef]
 
+    _HAS_ORJSON = False
+
+try:
+    import ijson
+except ImportError:  # streaming responses is optional
+    ijson = None
 
 from .common import (
     EquityOrderSide,
@@ -18,34 +47,41 @@ from .common import (
 )
 from .exceptions import TradierError, APIError, AuthError
 from .const import (
-    API_ACCOUNTS,
+    CACHE_MAX_ENTRIES,
     API_BALANCES,
-    API_BETA,
-    API_CALENDAR,
-    API_CALENDARS,
-    API_CHAINS,
-    API_CLOCK,
-    API_COMPANY,
-    API_DIVIDENDS,
-    API_EXPIRATIONS,
-    API_FUNDAMENTALS,
     API_GAINLOSS,
     API_HISTORY,
-    API_LOOKUP,
-    API_MARKETS,
-    API_OPTIONS,
     API_ORDERS,
     API_POSITIONS,
-    API_PROFILE,
-    API_QUOTES,
     API_SANDBOX_URL,
-    API_SEARCH,
-    API_STRIKES,
-    API_TIMESALES,
     API_URL,
-    API_USER,
-    API_V1,
     HTTP_CALL_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_MAX_REQUESTS,
+    HTTP_MAX_RETRIES,
+    HTTP_READ_TIMEOUT,
+    HTTP_RETRY_BACKOFF,
+    HTTP_THROTTLE_RECOVERY,
+    JSON_THREAD_THRESHOLD,
+    PATH_ACCOUNTS,
+    PATH_CALENDAR,
+    PATH_CALENDARS,
+    PATH_CLOCK,
+    PATH_COMPANY,
+    PATH_DIVIDENDS,
+    PATH_HISTORICAL_QUOTES,
+    PATH_LOOKUP,
+    PATH_OPTION_CHAINS,
+    PATH_OPTION_EXPIRATIONS,
+    PATH_OPTION_STRIKES,
+    PATH_QUOTES,
+    PATH_SEARCH,
+    PATH_TIMESALES,
+    PATH_USER_PROFILE,
+    QUOTE_BATCH_DELAY,
+    QUOTE_BATCH_SIZE,
     RAW_ACCOUNT_HISTORY,
     RAW_BALANCES,
     RAW_CALENDAR,
@@ -58,55 +94,233 @@ from .const import (
     RAW_GAINLOSS,
     RAW_HISTORICAL_QUOTES,
     RAW_LOOKUP,
-    RAW_ORDER_DETAIL,
     RAW_ORDERS,
+    RAW_ORDER_DETAIL,
     RAW_PLACE_EQUITY_ORDER,
     RAW_PLACE_OPTION_ORDER,
     RAW_POSITIONS,
+    RAW_QUOTES,
     RAW_SEARCH,
     RAW_STRIKES,
     RAW_TIMESALES,
     RAW_USER_PROFILE,
-    RAW_QUOTES,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# JSON parsers hold the GIL, so parsing in a thread only keeps the event loop
+# responsive on free-threaded builds of Python
+_PARSE_IN_THREAD = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+_TRUE = "true"
+_FALSE = "false"
+_TIMEOUT = ClientTimeout(
+    total=HTTP_CALL_TIMEOUT,
+    connect=HTTP_CONNECT_TIMEOUT,
+    sock_connect=HTTP_CONNECT_TIMEOUT,
+    sock_read=HTTP_READ_TIMEOUT,
+)
+
+
+def _bool(value: bool) -> str:
+    """Format a boolean query param the way the API expects it."""
+    return _TRUE if value else _FALSE
+
+
+def _params(*pairs: tuple[str, Any]) -> tuple[tuple[str, Any], ...]:
+    """Build query params, skipping the optional ones that were not given."""
+    return tuple(pair for pair in pairs if pair[1])
+
+
+def _iso_date(d: date) -> str:
+    """Format a date as YYYY-MM-DD, without going through strftime."""
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+
+def _iso_minute(d: datetime) -> str:
+    """Format a datetime as YYYY-MM-DD HH:MM, without going through strftime."""
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d} {d.hour:02d}:{d.minute:02d}"
+
+
+def _cache_key(token: str, url: str, path: str, params: Any | None) -> tuple:
+    """Build a hashable cache key for a request.
+    The token and base url are included, so responses are never reused across
+    accounts or between the sandbox and production APIs."""
+    items = params.items() if isinstance(params, Mapping) else params or ()
+    return (token, url, path, tuple(sorted(items)))
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize request payloads for aiohttp, which expects a str."""
+    res = orjson.dumps(obj)
+    return res.decode() if isinstance(res, bytes) else res
+
 
 class TradierAPIAdapter:
-    """Access Tradier API."""
+    """Access Tradier API.
+
+    Concurrent identical GET requests are sent once and every caller receives the
+    same response dict, as do callers served from the cache. Treat responses as
+    read-only and copy them before making changes."""
 
     def __init__(
-        self, aiohttp_session: ClientSession | None, token: str = "", sandbox=True
+        self,
+        aiohttp_session: ClientSession | None = None,
+        token: str = "",
+        sandbox=True,
+        keep_raw: bool = False,
     ):
-        """Set up the Adapter."""
+        """Set up the Adapter.
+
+        If no aiohttp_session is given, the adapter creates one on first use and
+        reuses it for all requests. Call close() (or use the adapter as an async
+        context manager) to release it. Its connector keeps connections alive and
+        caches DNS lookups; callers passing their own session are responsible for
+        configuring it similarly.
+
+        Set keep_raw to keep the last response of each endpoint, available through
+        raw_data(). This is meant for diagnostics and is off by default, since large
+        responses (e.g. option chains) would otherwise stay in memory."""
 
         self.aiohttp_session: ClientSession | None = aiohttp_session
         self.token = token
         self.url = API_SANDBOX_URL if sandbox else API_URL
 
+        self._keep_raw = keep_raw
+        self._owns_session = aiohttp_session is None
+        self._closed = False
         self._api_raw_data: dict[str, Any] = {}
 
-    async def _api_request(
+        # Admission gate for concurrent requests. A Condition guarding a counter
+        # (instead of a Semaphore) allows the limit to be lowered at runtime.
+        self._inflight = 0
+        self._cmax = HTTP_MAX_REQUESTS
+        self._cond = asyncio.Condition()
+        self._successes = 0
+        self._throttled_until = 0.0
+
+        # Single symbol quotes waiting to be sent together in one request
+        self._quote_queue: list[tuple[str, asyncio.Future]] = []
+        self._quote_flush: asyncio.TimerHandle | None = None
+        self._quote_tasks: set[asyncio.Task] = set()
+
+        # Recent GET responses, as (expiration time, response), in LRU order
+        self._cache: OrderedDict[tuple, tuple[float, dict[str, Any]]] = OrderedDict()
+        # GET requests in progress, shared by concurrent identical calls
+        self._inflight_gets: dict[tuple, asyncio.Task] = {}
+
+    @property
+    def token(self) -> str:
+        """Access token used to authenticate requests."""
+        return self._token
+
+    @token.setter
+    def token(self, token: str) -> None:
+        self._token = token
+        self._headers = MappingProxyType(
+            {
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/json",
+            }
+        )
+
+    async def __aenter__(self) -> "TradierAPIAdapter":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Cancel pending requests and close the aiohttp session if it was created
+        by the adapter. Requests made after closing raise TradierError."""
+
+        self._closed = True
+
+        if self._quote_flush is not None:
+            self._quote_flush.cancel()
+            self._quote_flush = None
+        for _, fut in self._quote_queue:
+            fut.cancel()
+        self._quote_queue = []
+
+        tasks = [*self._quote_tasks, *self._inflight_gets.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._owns_session and self.aiohttp_session is not None:
+            await self.aiohttp_session.close()
+            self.aiohttp_session = None
+
+    def _get_session(self) -> ClientSession:
+        """Return the session used for requests, creating it if needed."""
+
+        if self._closed:
+            raise TradierError("Adapter is closed")
+
+        if self.aiohttp_session is None:
+            connector = TCPConnector(
+                limit=HTTP_MAX_REQUESTS,
+                limit_per_host=HTTP_MAX_REQUESTS,
+                use_dns_cache=True,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self.aiohttp_session = ClientSession(
+                connector=connector, json_serialize=_json_dumps
+            )
+
+        return self.aiohttp_session
+
+    async def _acquire_slot(self) -> None:
+        """Wait until a request slot is available and take it."""
+
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._inflight < self._cmax)
+            self._inflight += 1
+
+    async def _release_slot(self, success: bool) -> None:
+        """Give back a request slot and wake up a waiting request.
+        After enough successful requests, a lowered limit is raised again."""
+
+        async with self._cond:
+            self._inflight -= 1
+            waiters = 1
+            if success and self._cmax < HTTP_MAX_REQUESTS:
+                self._successes += 1
+                if self._successes >= HTTP_THROTTLE_RECOVERY:
+                    self._successes = 0
+                    self._cmax += 1
+                    waiters += 1
+                    _LOGGER.info("Concurrent requests raised to %d", self._cmax)
+            self._cond.notify(waiters)
+
+    async def _throttle(self, retry_after: float, lower: bool = True) -> None:
+        """Lower the concurrency limit after being rate limited by the API.
+        The limit is lowered at most once per Retry-After window, so that
+        concurrent requests hitting the same limit count once."""
+
+        async with self._cond:
+            now = time.monotonic()
+            self._successes = 0
+            if not lower or now < self._throttled_until:
+                return
+            self._throttled_until = now + retry_after
+            self._cmax = max(1, self._cmax - 1)
+            _LOGGER.warning("Rate limited, concurrent requests set to %d", self._cmax)
+
+    @asynccontextmanager
+    async def _request(
         self,
         method: str,
         path: str,
         payload: Any | None = None,
         params: Any | None = None,
-    ) -> dict[str, Any]:
-        """Tradier API request."""
+    ) -> AsyncIterator[ClientResponse]:
+        """Send a request to the Tradier API and yield the response."""
 
         full_url = f"{self.url}/{path}"
-
-        if self.aiohttp_session is None:
-            aiohttp_session = ClientSession()
-        else:
-            aiohttp_session = self.aiohttp_session
-
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Accept": "application/json",
-        }
+        headers = self._headers
 
         _LOGGER.debug(
             "aiohttp request: %s %s (params=%s) (headers=%s) (payload=%s)",
@@ -117,68 +331,230 @@ class TradierAPIAdapter:
             payload,
         )
 
-        try:
-            async with aiohttp_session.request(
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            # Fetched on every attempt, the adapter may be closed while retrying
+            aiohttp_session = self._get_session()
+            success = False
+            await self._acquire_slot()
+            try:
+                async with aiohttp_session.request(
+                    method,
+                    full_url,
+                    headers=headers,
+                    json=payload,
+                    params=params,
+                    timeout=_TIMEOUT,
+                ) as resp:
+                    if resp.ok:
+                        success = True
+                        yield resp
+                        return
+                    if resp.status == 429:
+                        # retries of the same request do not lower it further
+                        await self._throttle(self._retry_after(resp), attempt == 0)
+                    delay = self._retry_delay(method, resp, attempt)
+                    if delay is None:
+                        resp.raise_for_status()
+            except ClientConnectorError as err:
+                raise TradierError(err) from err
+            except ClientResponseError as err:
+                if err.status == 401:
+                    raise AuthError(err) from err
+                if 400 <= err.status < 500:
+                    raise APIError(err) from err
+                raise TradierError(err) from err
+            finally:
+                await self._release_slot(success)
+
+            _LOGGER.warning(
+                "%s %s failed with status %d, retrying in %.1fs",
                 method,
-                full_url,
-                headers=headers,
-                json=payload,
-                params=params,
-                raise_for_status=True,
-                timeout=HTTP_CALL_TIMEOUT,
-            ) as resp:
-                resp_text = await resp.text()
-        except ClientConnectorError as err:
-            raise TradierError(err) from err
-        except ClientResponseError as err:
-            if err.status == 400:
-                raise APIError(err) from err
-            if err.status == 401:
-                raise AuthError(err) from err
-            raise TradierError(err) from err
+                path,
+                resp.status,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_after(resp: ClientResponse) -> float:
+        """Return the delay requested by a rate limited response.
+        The delay is capped at HTTP_CALL_TIMEOUT, so a bogus header cannot
+        block a call for longer than a request may take."""
+
+        try:
+            delay = float(resp.headers.get("Retry-After", HTTP_RETRY_BACKOFF))
+        except ValueError:  # Retry-After can also be an HTTP date
+            return HTTP_RETRY_BACKOFF
+        if math.isnan(delay):
+            return HTTP_RETRY_BACKOFF
+        return min(max(delay, 0.0), HTTP_CALL_TIMEOUT)
+
+    @staticmethod
+    def _retry_delay(method: str, resp: ClientResponse, attempt: int) -> float | None:
+        """Return how long to wait before retrying a failed request, or None if
+        it should not be retried. Rate limited requests are retried after the
+        Retry-After delay, server errors in GET requests with exponential backoff.
+        """
+
+        if attempt >= HTTP_MAX_RETRIES:
+            return None
+        if resp.status == 429:
+            return TradierAPIAdapter._retry_after(resp)
+        if resp.status >= 500 and method == "GET":
+            return HTTP_RETRY_BACKOFF * 2**attempt
+        return None
+
+    async def _api_request(
+        self,
+        method: str,
+        path: str,
+        payload: Any | None = None,
+        params: Any | None = None,
+        cache_ttl: float = 0,
+        raw_key: str | None = None,
+    ) -> dict[str, Any]:
+        """Tradier API request.
+        If raw_key is given, the response is kept under it when keep_raw is set."""
+
+        if method == "GET":
+            res = await self._get(path, params, cache_ttl)
+        else:
+            res = await self._fetch_json(method, path, payload, params)
+
+        if raw_key is not None and self._keep_raw:
+            self._api_raw_data[raw_key] = res
+
+        return res
+
+    async def _get(
+        self, path: str, params: Any | None, cache_ttl: float
+    ) -> dict[str, Any]:
+        """GET request to the Tradier API.
+        Concurrent identical GET requests are sent only once and share the response.
+        If cache_ttl is given, GET responses are reused for that many seconds."""
+
+        key = _cache_key(self._token, self.url, path, params)
+        if cache_ttl > 0:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        task = self._inflight_gets.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_json("GET", path, params=params))
+            self._inflight_gets[key] = task
+            task.add_done_callback(partial(self._finish_get, key))
+
+        # Cancelling one caller must not cancel the request for the others
+        res = await asyncio.shield(task)
+
+        if cache_ttl > 0:
+            self._cache[key] = (time.monotonic() + cache_ttl, res)
+            self._cache.move_to_end(key)
+            if len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+        return res
+
+    def _finish_get(self, key: tuple, task: asyncio.Task) -> None:
+        """Forget a finished GET request."""
 
-        finally:
-            if self.aiohttp_session is None:
-                await aiohttp_session.close()
+        if self._inflight_gets.get(key) is task:
+            del self._inflight_gets[key]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved if every caller was cancelled
+
+    async def _fetch_json(
+        self,
+        method: str,
+        path: str,
+        payload: Any | None = None,
+        params: Any | None = None,
+    ) -> dict[str, Any]:
+        """Send a request and decode its JSON response."""
+
+        async with self._request(method, path, payload, params) as resp:
+            resp_body = await resp.read()
 
         try:
-            resp_json = json.loads(resp_text)
-        except json.JSONDecodeError as err:
-            _LOGGER.error("Problems decoding response %s", resp_text)
+            if _PARSE_IN_THREAD and len(resp_body) > JSON_THREAD_THRESHOLD:
+                resp_json = await asyncio.to_thread(orjson.loads, resp_body)
+            else:
+                resp_json = orjson.loads(resp_body)
+        except orjson.JSONDecodeError as err:
+            _LOGGER.error("Problems decoding response %r", resp_body[:512])
             raise TradierError(err) from err
 
         _LOGGER.debug("aiohttp response: %s", resp_json)
         return cast(dict[str, Any], resp_json)
 
+    async def _api_request_streamed(
+        self,
+        method: str,
+        path: str,
+        prefix: str,
+        fields: tuple[str, ...],
+        params: Any | None = None,
+    ) -> list[dict[str, Any]]:
+        """Tradier API request that parses the response incrementally.
+        Only the objects under prefix are built, keeping just the given fields.
+        The API returns a single object instead of a list when there is only one,
+        so both a list of objects and a lone object are accepted."""
+
+        item_prefixes = (prefix, f"{prefix}.item")
+        items = []
+        builder = None
+        builder_prefix = ""
+
+        async with self._request(method, path, params=params) as resp:
+            try:
+                async for event_prefix, event, value in ijson.parse_async(
+                    resp.content, use_float=True
+                ):
+                    if builder is None:
+                        if event == "start_map" and event_prefix in item_prefixes:
+                            builder = ijson.ObjectBuilder()
+                            builder_prefix = event_prefix
+                            builder.event(event, value)
+                        continue
+
+                    builder.event(event, value)
+                    if event == "end_map" and event_prefix == builder_prefix:
+                        item = builder.value
+                        items.append({f: item[f] for f in fields if f in item})
+                        builder = None
+            except ijson.JSONError as err:
+                raise TradierError(err) from err
+
+        _LOGGER.debug("aiohttp response: %s", items)
+        return items
+
     ############ Account
 
     async def api_get_user_profile(self) -> dict[str, Any]:
         "Get user profile (includes account metadata)."
-        res = await self._api_request(
-            "GET",
-            f"{API_V1}/{API_USER}/{API_PROFILE}",
+        return await self._api_request(
+            "GET", PATH_USER_PROFILE, raw_key=RAW_USER_PROFILE
         )
-        self._api_raw_data[RAW_USER_PROFILE] = res
 
-        return res
+    async def _get_account_resource(
+        self, account_id: str, resource: str, raw_key: str
+    ) -> dict[str, Any]:
+        """Get a resource of an account that takes no params."""
+        return await self._api_request(
+            "GET", "/".join((PATH_ACCOUNTS, account_id, resource)), raw_key=raw_key
+        )
 
     async def api_get_balances(self, account_id: str) -> dict[str, Any]:
         """Get account balances."""
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_ACCOUNTS}/{account_id}/{API_BALANCES}"
-        )
-        self._api_raw_data[RAW_BALANCES] = res
-
-        return res
+        return await self._get_account_resource(account_id, API_BALANCES, RAW_BALANCES)
 
     async def api_get_positions(self, account_id: str) -> dict[str, Any]:
         """Get account positions."""
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_ACCOUNTS}/{account_id}/{API_POSITIONS}"
+        return await self._get_account_resource(
+            account_id, API_POSITIONS, RAW_POSITIONS
         )
-        self._api_raw_data[RAW_POSITIONS] = res
-
-        return res
 
     async def api_get_account_history(
         self,
@@ -193,30 +569,23 @@ class TradierAPIAdapter:
     ) -> dict[str, Any]:
         """Get account history."""
 
-        params = {
-            "account_id": account_id,
-        }
-        if page:
-            params["page"] = "f{page}"
-        if limit:
-            params["limit"] = f"{limit}"
-        if type_:
-            params["type_"] = f"{type_}"
-        if start:
-            params["start"] = start.strftime("%Y-%m-%d")
-        if end:
-            params["end"] = end.strftime("%Y-%m-%d")
-        if symbol:
-            params["symbol"] = symbol
-        if exact_match:
-            params["exact_match"] = f"{exact_match}"
-
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_ACCOUNTS}/{account_id}/{API_HISTORY}", params=params
+        params = _params(
+            ("account_id", account_id),
+            ("page", page),
+            ("limit", limit),
+            ("type", type_),
+            ("start", start and _iso_date(start)),
+            ("end", end and _iso_date(end)),
+            ("symbol", symbol),
+            ("exact_match", exact_match and _TRUE),
         )
-        self._api_raw_data[RAW_ACCOUNT_HISTORY] = res
 
-        return res
+        return await self._api_request(
+            "GET",
+            "/".join((PATH_ACCOUNTS, account_id, API_HISTORY)),
+            params=params,
+            raw_key=RAW_ACCOUNT_HISTORY,
+        )
 
     async def api_get_account_gainloss(
         self,
@@ -232,30 +601,23 @@ class TradierAPIAdapter:
     ) -> dict[str, Any]:
         """Get account history."""
 
-        params = {
-            "account_id": account_id,
-        }
-        if page:
-            params["page"] = "f{page}"
-        if limit:
-            params["limit"] = f"{limit}"
-        if sort_by:
-            params["sortBy"] = str(sort_by)
-        if sort_order:
-            params["sort"] = str(sort_order)
-        if start:
-            params["start"] = start.strftime("%Y-%m-%d")
-        if end:
-            params["end"] = end.strftime("%Y-%m-%d")
-        if symbol:
-            params["symbol"] = symbol
-
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_ACCOUNTS}/{account_id}/{API_GAINLOSS}", params=params
+        params = _params(
+            ("account_id", account_id),
+            ("page", page),
+            ("limit", limit),
+            ("sortBy", sort_by and str(sort_by)),
+            ("sort", sort_order and str(sort_order)),
+            ("start", start and _iso_date(start)),
+            ("end", end and _iso_date(end)),
+            ("symbol", symbol),
         )
-        self._api_raw_data[RAW_GAINLOSS] = res
 
-        return res
+        return await self._api_request(
+            "GET",
+            "/".join((PATH_ACCOUNTS, account_id, API_GAINLOSS)),
+            params=params,
+            raw_key=RAW_GAINLOSS,
+        )
 
     async def api_get_account_orders(
         self,
@@ -266,19 +628,18 @@ class TradierAPIAdapter:
         """Retrieve orders placed within an account.
         This API will return orders placed for the market session of the present calendar day."""
 
-        params = {"account_id": account_id}
-
-        if page:
-            params["page"] = "f{page}"
-        if include_tags:
-            params["includeTags"] = str(include_tags)
-
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_ACCOUNTS}/{account_id}/{API_ORDERS}", params=params
+        params = _params(
+            ("account_id", account_id),
+            ("page", page),
+            ("includeTags", include_tags and _TRUE),
         )
-        self._api_raw_data[RAW_ORDERS] = res
 
-        return res
+        return await self._api_request(
+            "GET",
+            "/".join((PATH_ACCOUNTS, account_id, API_ORDERS)),
+            params=params,
+            raw_key=RAW_ORDERS,
+        )
 
     async def api_get_order(
         self,
@@ -288,19 +649,17 @@ class TradierAPIAdapter:
     ) -> dict[str, Any]:
         """Get detailed information about a previously placed order."""
 
-        params = {"account_id": account_id}
-
-        if include_tags:
-            params["includeTags"] = str(include_tags)
+        params = _params(
+            ("account_id", account_id),
+            ("includeTags", include_tags and _TRUE),
+        )
 
-        res = await self._api_request(
+        return await self._api_request(
             "GET",
-            f"{API_V1}/{API_ACCOUNTS}/{account_id}/{API_ORDERS}/{order_id}",
+            "/".join((PATH_ACCOUNTS, account_id, API_ORDERS, order_id)),
             params=params,
+            raw_key=RAW_ORDER_DETAIL,
         )
-        self._api_raw_data[RAW_ORDER_DETAIL] = res
-
-        return res
 
     ############# Market Data
 
@@ -310,13 +669,79 @@ class TradierAPIAdapter:
         """Get a list of symbols using a keyword lookup on the symbols description.
         Results are in descending order by average volume of the security."""
 
-        params = {"symbols": ",".join(symbols), "greeks": f"{greeks}"}
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_MARKETS}/{API_QUOTES}", params=params
+        params = (("symbols", ",".join(symbols)), ("greeks", _bool(greeks)))
+        return await self._api_request(
+            "GET", PATH_QUOTES, params=params, raw_key=RAW_QUOTES
         )
-        self._api_raw_data[RAW_QUOTES] = res
 
-        return res
+    async def get_quote(self, symbol: str) -> dict[str, Any]:
+        """Get the quote of a single symbol.
+        Concurrent calls are batched into a single api_get_quotes request."""
+
+        if self._closed:
+            raise TradierError("Adapter is closed")
+
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._quote_queue.append((symbol, fut))
+
+        if len(self._quote_queue) >= QUOTE_BATCH_SIZE:
+            self._flush_quotes()
+        elif self._quote_flush is None:
+            self._quote_flush = loop.call_later(QUOTE_BATCH_DELAY, self._flush_quotes)
+
+        return await fut
+
+    def _flush_quotes(self) -> None:
+        """Send the queued quote requests as one batch."""
+
+        if self._quote_flush is not None:
+            self._quote_flush.cancel()
+            self._quote_flush = None
+
+        batch, self._quote_queue = self._quote_queue, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._fetch_quote_batch(batch))
+        self._quote_tasks.add(task)
+        task.add_done_callback(partial(self._finish_quote_batch, batch))
+
+    def _finish_quote_batch(
+        self, batch: list[tuple[str, asyncio.Future]], task: asyncio.Task
+    ) -> None:
+        """Forget a finished batch and cancel the futures it left unresolved.
+        A batch cancelled before it started never runs, so this is the only
+        place guaranteed to see it."""
+
+        self._quote_tasks.discard(task)
+        for _, fut in batch:
+            fut.cancel()
+
+    async def _fetch_quote_batch(self, batch: list[tuple[str, asyncio.Future]]):
+        """Get quotes for a batch of symbols and resolve the callers' futures."""
+
+        symbols = list(dict.fromkeys(symbol for symbol, _ in batch))
+        try:
+            res = await self.api_get_quotes(symbols)
+        except Exception as err:  # pylint: disable=broad-except
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(err)
+            return
+
+        quotes = (res.get("quotes") or {}).get("quote", [])
+        if isinstance(quotes, dict):  # a single quote is not wrapped in a list
+            quotes = [quotes]
+        by_symbol = {quote["symbol"].upper(): quote for quote in quotes}
+
+        for symbol, fut in batch:
+            if fut.done():  # caller was cancelled
+                continue
+            if (quote := by_symbol.get(symbol.upper())) is not None:
+                fut.set_result(quote)
+            else:
+                fut.set_exception(APIError(f"No quote for symbol {symbol}"))
 
     async def api_get_option_expirations(
         self,
@@ -325,24 +750,25 @@ class TradierAPIAdapter:
         strikes: bool = False,
         contract_size: bool = False,
         expiration_type: bool = False,
+        cache_ttl: float = 300.0,
     ) -> dict[str, Any]:
-        """Get expiration dates for a particular underlying."""
-
-        params = {
-            "symbol": symbol,
-            "includeAllRoots": f"{include_all_roots}",
-            "strikes": f"{strikes}",
-            "contractSize": f"{contract_size}",
-            "expirationType": f"{expiration_type}",
-        }
-        res = await self._api_request(
+        """Get expiration dates for a particular underlying.
+        Responses are cached for cache_ttl seconds."""
+
+        params = (
+            ("symbol", symbol),
+            ("includeAllRoots", _bool(include_all_roots)),
+            ("strikes", _bool(strikes)),
+            ("contractSize", _bool(contract_size)),
+            ("expirationType", _bool(expiration_type)),
+        )
+        return await self._api_request(
             "GET",
-            f"{API_V1}/{API_MARKETS}/{API_OPTIONS}/{API_EXPIRATIONS}",
+            PATH_OPTION_EXPIRATIONS,
             params=params,
+            cache_ttl=cache_ttl,
+            raw_key=RAW_EXPIRATIONS,
         )
-        self._api_raw_data[RAW_EXPIRATIONS] = res
-
-        return res
 
     async def api_get_option_strikes(
         self,
@@ -351,30 +777,49 @@ class TradierAPIAdapter:
     ) -> dict[str, Any]:
         """Get an options strike prices for a specified expiration date."""
 
-        params = {
-            "symbol": symbol,
-            "expiration": expiration.strftime("%Y-%m-%d"),
-        }
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_MARKETS}/{API_OPTIONS}/{API_STRIKES}", params=params
+        params = (("symbol", symbol), ("expiration", _iso_date(expiration)))
+        return await self._api_request(
+            "GET", PATH_OPTION_STRIKES, params=params, raw_key=RAW_STRIKES
         )
-        self._api_raw_data[RAW_STRIKES] = res
-
-        return res
 
     async def api_get_option_chains(
-        self, symbol: str, expiration: date, greeks: bool = False
+        self,
+        symbol: str,
+        expiration: date,
+        greeks: bool = False,
+        fields: tuple[str, ...] | None = None,
     ) -> dict[str, Any]:
-        """Get all quotes in an option chain."""
-        params = {
-            "symbol": symbol,
-            "expiration": expiration.strftime("%Y-%m-%d"),
-            "greeks": f"{greeks}",
-        }
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_MARKETS}/{API_OPTIONS}/{API_CHAINS}", params=params
+        """Get all quotes in an option chain.
+        If fields is given, only those fields of each option are returned. With ijson
+        installed, the response is then parsed incrementally to save memory."""
+        params = (
+            ("symbol", symbol),
+            ("expiration", _iso_date(expiration)),
+            ("greeks", _bool(greeks)),
         )
-        self._api_raw_data[RAW_CHAINS] = res
+        if not fields:
+            return await self._api_request(
+                "GET", PATH_OPTION_CHAINS, params=params, raw_key=RAW_CHAINS
+            )
+
+        if ijson is not None:
+            options = await self._api_request_streamed(
+                "GET", PATH_OPTION_CHAINS, "options.option", fields, params=params
+            )
+        else:
+            # Build new dicts, the response is shared with concurrent callers
+            res = await self._api_request("GET", PATH_OPTION_CHAINS, params=params)
+            options = (res.get("options") or {}).get("option", [])
+            if isinstance(options, dict):  # a single option is not in a list
+                options = [options]
+            options = [
+                {field: opt[field] for field in fields if field in opt}
+                for opt in options
+            ]
+
+        res = {"options": {"option": options}}
+        if self._keep_raw:
+            self._api_raw_data[RAW_CHAINS] = res
 
         return res
 
@@ -391,22 +836,17 @@ class TradierAPIAdapter:
         reasonable start/end times. You can fetch historical pricing for options
         by passing the OCC option symbol (ex. AAPL220617C00270000) as the symbol."""
 
-        params = {"symbol": symbol}
-        if interval:
-            params["interval"] = f"{interval}"
-        if start:
-            params["start"] = start.strftime("%Y-%m-%d")
-        if end:
-            params["end"] = end.strftime("%Y-%m-%d")
-        if session_filter:
-            params["session_filter"] = f"{session_filter}"
-
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_MARKETS}/{API_HISTORY}", params=params
+        params = _params(
+            ("symbol", symbol),
+            ("interval", interval),
+            ("start", start and _iso_date(start)),
+            ("end", end and _iso_date(end)),
+            ("session_filter", session_filter),
         )
-        self._api_raw_data[RAW_HISTORICAL_QUOTES] = res
 
-        return res
+        return await self._api_request(
+            "GET", PATH_HISTORICAL_QUOTES, params=params, raw_key=RAW_HISTORICAL_QUOTES
+        )
 
     async def api_get_timesales(
         self,
@@ -422,36 +862,31 @@ class TradierAPIAdapter:
         data set for high-volume symbols, so the time slice needs to be much smaller
         to keep downloads time reasonable."""
 
-        params = {"symbol": symbol}
-        if interval:
-            params["interval"] = f"{interval}"
-        if start:
-            params["start"] = start.strftime("%Y-%m-%d %H:%M")
-        if end:
-            params["end"] = end.strftime("%Y-%m-%d %H:%M")
-        if session_filter:
-            params["session_filter"] = f"{session_filter}"
-
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_MARKETS}/{API_TIMESALES}", params=params
+        params = _params(
+            ("symbol", symbol),
+            ("interval", interval),
+            ("start", start and _iso_minute(start)),
+            ("end", end and _iso_minute(end)),
+            ("session_filter", session_filter),
         )
-        self._api_raw_data[RAW_TIMESALES] = res
 
-        return res
+        return await self._api_request(
+            "GET", PATH_TIMESALES, params=params, raw_key=RAW_TIMESALES
+        )
 
-    async def api_get_clock(self, delayed: bool = False) -> dict[str, Any]:
+    async def api_get_clock(
+        self, delayed: bool = False, cache_ttl: float = 1.0
+    ) -> dict[str, Any]:
         """Get the intraday market status.
         This call will change and return information pertaining to the current
         day. If programming logic on whether the market is open/closed – this
-        API call should be used to determine the current state."""
+        API call should be used to determine the current state.
+        Responses are cached for cache_ttl seconds."""
 
-        params = {"delayed": f"{delayed}"}
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_MARKETS}/{API_CLOCK}", params=params
+        params = (("delayed", _bool(delayed)),)
+        return await self._api_request(
+            "GET", PATH_CLOCK, params=params, cache_ttl=cache_ttl, raw_key=RAW_CLOCK
         )
-        self._api_raw_data[RAW_CLOCK] = res
-
-        return res
 
     async def api_get_calendar(
         self, month: int | None = None, year: int | None = None
@@ -460,92 +895,64 @@ class TradierAPIAdapter:
         This can be used to plan ahead regarding strategies.
         However, api_get_clock should be used to determine the current status of the market.
         """
-        params = {
-            "month": f"{month:2f}",
-            "year": f"{year}",
-        }
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_MARKETS}/{API_CALENDAR}", params=params
+        params = _params(("month", month), ("year", year))
+        return await self._api_request(
+            "GET", PATH_CALENDAR, params=params, raw_key=RAW_CALENDAR
         )
-        self._api_raw_data[RAW_CALENDAR] = res
-
-        return res
 
     async def api_get_search(self, query: str) -> dict[str, Any]:
         """Get a list of symbols using a keyword lookup on the symbols description.
         Results are in descending order by average volume of the security.
         This can be used for simple search functions."""
 
-        params = {"q": query}
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_MARKETS}/{API_SEARCH}", params=params
+        params = (("q", query),)
+        return await self._api_request(
+            "GET", PATH_SEARCH, params=params, raw_key=RAW_SEARCH
         )
-        self._api_raw_data[RAW_SEARCH] = res
-
-        return res
 
     async def api_get_lookup(
         self,
         query: str,
         exchanges: list[str] | None = None,
         types: list[str] | None = None,
+        cache_ttl: float = 60.0,
     ) -> dict[str, Any]:
         """Search for a symbol using the ticker symbol or partial symbol.
         Results are in descending order by average volume of the security.
-        This can be used for simple search functions."""
+        This can be used for simple search functions.
+        Responses are cached for cache_ttl seconds."""
 
-        params = {"q": query}
-        if exchanges:
-            params["exchanges"] = ",".join(exchanges)
-        if types:
-            params["types"] = ",".join(types)
-
-        res = await self._api_request(
-            "GET", f"{API_V1}/{API_MARKETS}/{API_LOOKUP}", params=params
+        params = _params(
+            ("q", query),
+            ("exchanges", exchanges and ",".join(exchanges)),
+            ("types", types and ",".join(types)),
+        )
+        return await self._api_request(
+            "GET", PATH_LOOKUP, params=params, cache_ttl=cache_ttl, raw_key=RAW_LOOKUP
         )
-        self._api_raw_data[RAW_LOOKUP] = res
-
-        return res
 
     ############# Fundamentals
 
+    async def _get_for_symbols(
+        self, path: str, symbols: list[str], raw_key: str
+    ) -> dict[str, Any]:
+        """Get information for a list of symbols."""
+        params = (("symbols", ",".join(symbols)),)
+        return await self._api_request("GET", path, params=params, raw_key=raw_key)
+
     async def api_get_company(self, symbols: list[str]) -> dict[str, Any]:
         """Get company fundamental information."""
-        params = {"symbols": ",".join(symbols)}
-        res = await self._api_request(
-            "GET",
-            f"{API_BETA}/{API_MARKETS}/{API_FUNDAMENTALS}/{API_COMPANY}",
-            params=params,
-        )
-        self._api_raw_data[RAW_COMPANY] = res
+        return await self._get_for_symbols(PATH_COMPANY, symbols, RAW_COMPANY)
 
     async def api_get_calendars(self, symbols: list[str]) -> dict[str, Any]:
         """Get corporate calendar information for securities.
         This does not include dividend information."""
-
-        params = {"symbols": ",".join(symbols)}
-        res = await self._api_request(
-            "GET",
-            f"{API_BETA}/{API_MARKETS}/{API_FUNDAMENTALS}/{API_CALENDARS}",
-            params=params,
-        )
-        self._api_raw_data[RAW_CALENDARS] = res
-
-        return res
+        return await self._get_for_symbols(PATH_CALENDARS, symbols, RAW_CALENDARS)
 
     async def api_get_dividends(self, symbols: list[str]) -> dict[str, Any]:
         """Get dividend information for a security. This will include previous
         dividends as well as formally announced future dividend dates."""
-
-        params = {"symbols": ",".join(symbols)}
-        res = await self._api_request(
-            "GET",
-            f"{API_BETA}/{API_MARKETS}/{API_FUNDAMENTALS}/{API_DIVIDENDS}",
-            params=params,
-        )
-        self._api_raw_data[RAW_DIVIDENDS] = res
-
-        return res
+        return await self._get_for_symbols(PATH_DIVIDENDS, symbols, RAW_DIVIDENDS)
 
     ############# Trading
 
@@ -580,14 +987,12 @@ class TradierAPIAdapter:
             # FIXME validate Maximum lenght of 255 characters. Valid characters are letters, numbers and -
             params["tag"] = tag
 
-        res = await self._api_request(
+        return await self._api_request(
             "POST",
-            f"{API_V1}/{API_ACCOUNTS}/{account_id}/{API_ORDERS}",
+            "/".join((PATH_ACCOUNTS, account_id, API_ORDERS)),
             params=params,
+            raw_key=RAW_PLACE_EQUITY_ORDER,
         )
-        self._api_raw_data[RAW_PLACE_EQUITY_ORDER] = res
-
-        return res
 
     async def api_place_option_order(
         self,
@@ -622,15 +1027,22 @@ class TradierAPIAdapter:
             # FIXME validate Maximum lenght of 255 characters. Valid characters are letters, numbers and -
             params["tag"] = tag
 
-        res = await self._api_request(
+        return await self._api_request(
             "POST",
-            f"{API_V1}/{API_ACCOUNTS}/{account_id}/{API_ORDERS}",
+            "/".join((PATH_ACCOUNTS, account_id, API_ORDERS)),
             params=params,
+            raw_key=RAW_PLACE_OPTION_ORDER,
         )
-        self._api_raw_data[RAW_PLACE_OPTION_ORDER] = res
 
-        return res
+    def raw_data(self) -> Mapping[str, Any]:
+        """Return a read-only view of the raw API data.
+        Empty unless the adapter was created with keep_raw."""
+        return MappingProxyType(self._api_raw_data)
 
-    def raw_data(self) -> dict[str, Any]:
-        """Return raw API data."""
-        return self._api_raw_data
+    def dump_raw(self, path: str | Path) -> None:
+        """Write the raw API data to a file as indented JSON."""
+        if _HAS_ORJSON:
+            data = orjson.dumps(self._api_raw_data, option=orjson.OPT_INDENT_2)
+        else:
+            data = orjson.dumps(self._api_raw_data, indent=2).encode()
+        Path(path).write_bytes(data)
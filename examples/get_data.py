@@ -1,6 +1,5 @@
 """Basic example for TradierRestAdapter."""
 
-import json
 import aiohttp
 import asyncio
 import datetime
@@ -78,7 +77,9 @@ async def main():
         token = file.readline().strip()
 
     async with aiohttp.ClientSession() as aiohttp_session:
-        client = TradierAPIAdapter(aiohttp_session, token, sandbox=False)
+        client = TradierAPIAdapter(
+            aiohttp_session, token, sandbox=False, keep_raw=True
+        )
 
         try:
             await do_account_stuff(client)
@@ -88,8 +89,7 @@ async def main():
         except TradierError as err:
             print(f"Error: {err.args}")
 
-    with open("data.txt", mode="w", encoding="utf-8") as file:
-        file.write(json.dumps(client.raw_data(), indent=4))
+    client.dump_raw("data.txt")
 
 
 if __name__ == "__main__":
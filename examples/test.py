@@ -1,14 +1,11 @@
 """Basic example for TradierRestAdapter."""
 
-import json
-import aiohttp
 import asyncio
 import datetime
 import logging
 
 
-# from aiotradier import TradierAPIAdapter, TradierError
-import aiotradier
+from aiotradier import TradierAPIAdapter, TradierError
 
 
 _LOGGER = logging.getLogger("aiotradier.tradier_rest")
@@ -36,6 +33,7 @@ async def do_market_stuff(client):
     symbol = "M"
 
     res = await client.api_get_quotes([symbol], False)
+    await asyncio.gather(*(client.get_quote(s) for s in ("M", "AAPL", "GOOG")))
 
     res = await client.api_get_option_expirations(symbol, include_all_roots=False)
     next_expiration = res["expirations"]["date"][0]
@@ -82,9 +80,7 @@ async def main():
     with open("token.txt", "r", encoding="utf-8") as file:
         token = file.readline().strip()
 
-    async with aiohttp.ClientSession() as aiohttp_session:
-        client = TradierAPIAdapter(aiohttp_session, token)
-
+    async with TradierAPIAdapter(token=token, keep_raw=True) as client:
         try:
             await do_account_stuff(client)
             await do_market_stuff(client)
@@ -93,8 +89,7 @@ async def main():
         except TradierError as err:
             print(f"Error: {err.args}")
 
-    with open("data.txt", mode="w", encoding="utf-8") as file:
-        file.write(json.dumps(client.raw_data(), indent=4))
+    client.dump_raw("data.txt")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,660 @@
+"""Tests for TradierAPIAdapter against a local aiohttp server."""
+
+import asyncio
+import json
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+
+from aiotradier import (
+    APIError,
+    AuthError,
+    EquityOrderSide,
+    OrderClass,
+    OrderDuration,
+    OrderType,
+    TradierAPIAdapter,
+    TradierError,
+)
+from aiotradier.const import (
+    HTTP_CALL_TIMEOUT,
+    HTTP_MAX_REQUESTS,
+    HTTP_MAX_RETRIES,
+    HTTP_RETRY_BACKOFF,
+)
+
+
+@pytest.fixture
+async def make_client(aiohttp_server):
+    """Return a factory that serves handler locally and builds an adapter for it."""
+
+    clients: list[TradierAPIAdapter] = []
+
+    async def factory(handler, **kwargs) -> TradierAPIAdapter:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        server = await aiohttp_server(app)
+
+        client = TradierAPIAdapter(token="token", **kwargs)
+        client.url = str(server.make_url("")).rstrip("/")
+        clients.append(client)
+        return client
+
+    yield factory
+
+    for client in clients:
+        await client.close()
+
+
+############ Quote batching
+
+
+async def test_get_quote_batches_concurrent_calls(make_client):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.query["symbols"])
+        symbols = request.query["symbols"].split(",")
+        quotes = [{"symbol": symbol, "last": 1.0} for symbol in symbols]
+        return web.json_response({"quotes": {"quote": quotes}})
+
+    client = await make_client(handler)
+    res = await asyncio.gather(*(client.get_quote(s) for s in ("A", "B", "A")))
+
+    assert [quote["symbol"] for quote in res] == ["A", "B", "A"]
+    assert requests == ["A,B"]
+
+
+async def test_get_quote_single_quote_response(make_client):
+    async def handler(request):
+        return web.json_response({"quotes": {"quote": {"symbol": "M", "last": 1}}})
+
+    client = await make_client(handler)
+
+    assert await client.get_quote("m") == {"symbol": "M", "last": 1}
+
+
+async def test_get_quote_missing_symbol(make_client):
+    async def handler(request):
+        return web.json_response(
+            {
+                "quotes": {
+                    "quote": {"symbol": "A", "last": 1},
+                    "unmatched_symbols": {"symbol": "BAD"},
+                }
+            }
+        )
+
+    client = await make_client(handler)
+    res = await asyncio.gather(
+        client.get_quote("A"), client.get_quote("BAD"), return_exceptions=True
+    )
+
+    assert res[0] == {"symbol": "A", "last": 1}
+    assert isinstance(res[1], APIError)
+
+
+async def test_get_quote_flushes_full_batch(make_client, monkeypatch):
+    monkeypatch.setattr("aiotradier.tradier_rest.QUOTE_BATCH_SIZE", 2)
+    requests = []
+
+    async def handler(request):
+        requests.append(request.query["symbols"])
+        symbols = request.query["symbols"].split(",")
+        quotes = [{"symbol": symbol} for symbol in symbols]
+        return web.json_response({"quotes": {"quote": quotes}})
+
+    client = await make_client(handler)
+    await asyncio.gather(*(client.get_quote(s) for s in ("A", "B", "C")))
+
+    assert sorted(requests) == ["A,B", "C"]
+
+
+############ Session lifecycle
+
+
+async def test_close_cancels_pending_work(make_client):
+    started = asyncio.Event()
+
+    async def handler(request):
+        started.set()
+        await asyncio.sleep(10)
+        return web.json_response({})
+
+    client = await make_client(handler)
+    queued = asyncio.create_task(client.get_quote("A"))
+    pending = asyncio.create_task(client.api_get_clock())
+    await started.wait()
+
+    await client.close()
+
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert client.aiohttp_session is None
+    assert not client._inflight_gets  # pylint: disable=protected-access
+
+
+async def test_close_before_quote_batch_starts(make_client, monkeypatch):
+    monkeypatch.setattr("aiotradier.tradier_rest.QUOTE_BATCH_SIZE", 2)
+
+    async def handler(request):
+        return web.json_response({})
+
+    client = await make_client(handler)
+    callers = [asyncio.create_task(client.get_quote(s)) for s in ("A", "B")]
+    # Let the callers queue and flush the batch, but not let the batch task run
+    await asyncio.sleep(0)
+    assert client._quote_tasks  # pylint: disable=protected-access
+
+    await client.close()
+
+    for caller in callers:
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(caller, 1)
+
+
+async def test_close_while_waiting_to_retry(make_client):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.method)
+        return web.Response(status=429, headers={"Retry-After": "0.1"})
+
+    client = await make_client(handler)
+    order = asyncio.create_task(
+        client.api_place_equity_order(
+            "123",
+            OrderClass.EQUITY,
+            "AAPL",
+            EquityOrderSide.BUY,
+            1,
+            OrderType.MARKET,
+            OrderDuration.DAY,
+        )
+    )
+    while not requests:
+        await asyncio.sleep(0.01)
+
+    await client.close()
+
+    with pytest.raises(TradierError, match="closed"):
+        await order
+    assert requests == ["POST"]
+
+
+async def test_requests_after_close_raise(make_client):
+    async def handler(request):
+        return web.json_response({})
+
+    client = await make_client(handler)
+    await client.api_get_search("a")
+    await client.close()
+
+    with pytest.raises(TradierError):
+        await client.api_get_search("a")
+    with pytest.raises(TradierError):
+        await client.get_quote("A")
+    assert client.aiohttp_session is None
+
+
+############ Concurrency gate
+
+
+async def test_concurrent_requests_are_capped(make_client):
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return web.json_response({})
+
+    client = await make_client(handler)
+    await asyncio.gather(*(client.api_get_search(f"q{i}") for i in range(12)))
+
+    assert peak == HTTP_MAX_REQUESTS
+
+
+async def test_rate_limit_lowers_limit_once_per_request(make_client, monkeypatch):
+    monkeypatch.setattr("aiotradier.tradier_rest.HTTP_THROTTLE_RECOVERY", 3)
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if request.query["q"] == "limited" and calls <= 3:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response({})
+
+    client = await make_client(handler)
+    await client.api_get_search("limited")
+
+    assert calls == 4
+    assert client._cmax == HTTP_MAX_REQUESTS - 1  # pylint: disable=protected-access
+
+    for i in range(3):
+        await client.api_get_search(f"q{i}")
+
+    assert client._cmax == HTTP_MAX_REQUESTS  # pylint: disable=protected-access
+
+
+############ Streamed option chains
+
+OPTIONS = [
+    {"symbol": f"M240105C0000{i}000", "strike": i + 0.5, "greeks": {"delta": 0.5}}
+    for i in range(3)
+]
+
+
+@pytest.fixture(params=[True, False], ids=["ijson", "no_ijson"])
+def with_ijson(request, monkeypatch):
+    """Run a test with and without the streamed parser."""
+    if not request.param:
+        monkeypatch.setattr("aiotradier.tradier_rest.ijson", None)
+    return request.param
+
+
+async def test_option_chains_projection(make_client, with_ijson):
+    async def handler(request):
+        return web.json_response({"options": {"option": OPTIONS}})
+
+    client = await make_client(handler)
+    res = await client.api_get_option_chains(
+        "M", date(2024, 1, 5), fields=("symbol", "strike")
+    )
+
+    assert res == {
+        "options": {
+            "option": [
+                {"symbol": opt["symbol"], "strike": opt["strike"]} for opt in OPTIONS
+            ]
+        }
+    }
+
+
+async def test_option_chains_projection_single_option(make_client, with_ijson):
+    async def handler(request):
+        return web.json_response({"options": {"option": OPTIONS[0]}})
+
+    client = await make_client(handler)
+    res = await client.api_get_option_chains(
+        "M", date(2024, 1, 5), fields=("symbol", "greeks")
+    )
+
+    assert res == {
+        "options": {
+            "option": [{"symbol": OPTIONS[0]["symbol"], "greeks": {"delta": 0.5}}]
+        }
+    }
+
+
+async def test_option_chains_projection_no_options(make_client, with_ijson):
+    async def handler(request):
+        return web.json_response({"options": None})
+
+    client = await make_client(handler)
+    res = await client.api_get_option_chains("M", date(2024, 1, 5), fields=("symbol",))
+
+    assert res == {"options": {"option": []}}
+
+
+############ Response cache
+
+
+async def test_cache_expires(make_client, monkeypatch):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.path)
+        return web.json_response({"clock": {"state": "open", "n": len(requests)}})
+
+    now = 1000.0
+    # Patch only the adapter's clock, the event loop also uses time.monotonic
+    clock = SimpleNamespace(monotonic=lambda: now)
+    monkeypatch.setattr("aiotradier.tradier_rest.time", clock)
+    client = await make_client(handler)
+
+    first = await client.api_get_clock(cache_ttl=1.0)
+    assert await client.api_get_clock(cache_ttl=1.0) == first
+    assert len(requests) == 1
+
+    now += 1.5
+    second = await client.api_get_clock(cache_ttl=1.0)
+    assert second["clock"]["n"] == 2
+    assert len(requests) == 2
+
+
+async def test_cache_is_per_token(make_client):
+    async def handler(request):
+        token = request.headers["Authorization"]
+        return web.json_response({"clock": {"token": token}})
+
+    client = await make_client(handler)
+
+    first = await client.api_get_clock()
+    client.token = "other"
+    second = await client.api_get_clock()
+
+    assert first == {"clock": {"token": "Bearer token"}}
+    assert second == {"clock": {"token": "Bearer other"}}
+
+
+############ Single-flight GET requests
+
+
+async def test_single_flight_survives_cancelled_caller(make_client):
+    requests = []
+    release = asyncio.Event()
+
+    async def handler(request):
+        requests.append(request.path)
+        await release.wait()
+        return web.json_response({"calendar": {"month": 1}})
+
+    client = await make_client(handler)
+
+    first = asyncio.create_task(client.api_get_calendar(month=1, year=2024))
+    second = asyncio.create_task(client.api_get_calendar(month=1, year=2024))
+    while not requests:
+        await asyncio.sleep(0.01)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+
+    assert await second == {"calendar": {"month": 1}}
+    assert len(requests) == 1
+    assert not client._inflight_gets
+
+
+async def test_single_flight_all_callers_cancelled(make_client):
+    requests = []
+    release = asyncio.Event()
+
+    async def handler(request):
+        requests.append(request.path)
+        await release.wait()
+        return web.json_response({"calendar": {"month": len(requests)}})
+
+    client = await make_client(handler)
+
+    caller = asyncio.create_task(client.api_get_calendar(month=1, year=2024))
+    while not requests:
+        await asyncio.sleep(0.01)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    # The request still completes and a later call sends a new one
+    release.set()
+    while client._inflight_gets:
+        await asyncio.sleep(0.01)
+    assert await client.api_get_calendar(month=1, year=2024) == {
+        "calendar": {"month": 2}
+    }
+
+
+############ Retries and error mapping
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Retry failed requests immediately."""
+    monkeypatch.setattr("aiotradier.tradier_rest.HTTP_RETRY_BACKOFF", 0)
+
+
+async def test_get_server_error_is_retried(make_client, no_backoff):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.path)
+        if len(requests) < 3:
+            return web.Response(status=503)
+        return web.json_response({"calendar": {"month": 1}})
+
+    client = await make_client(handler)
+
+    assert await client.api_get_calendar() == {"calendar": {"month": 1}}
+    assert len(requests) == 3
+
+
+async def test_get_server_error_gives_up(make_client, no_backoff):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.path)
+        return web.Response(status=500)
+
+    client = await make_client(handler)
+
+    with pytest.raises(TradierError) as exc_info:
+        await client.api_get_calendar()
+    assert not isinstance(exc_info.value, APIError)
+    assert len(requests) == HTTP_MAX_RETRIES + 1
+
+
+async def test_post_server_error_is_not_retried(make_client, no_backoff):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.path)
+        return web.Response(status=500)
+
+    client = await make_client(handler)
+
+    with pytest.raises(TradierError):
+        await client.api_place_equity_order(
+            "123",
+            OrderClass.EQUITY,
+            "AAPL",
+            EquityOrderSide.BUY,
+            1,
+            OrderType.MARKET,
+            OrderDuration.DAY,
+        )
+    assert len(requests) == 1
+
+
+async def test_rate_limited_request_is_retried(make_client):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.method)
+        if len(requests) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response({"order": {"id": 1}})
+
+    client = await make_client(handler)
+
+    res = await client.api_place_equity_order(
+        "123",
+        OrderClass.EQUITY,
+        "AAPL",
+        EquityOrderSide.BUY,
+        1,
+        OrderType.MARKET,
+        OrderDuration.DAY,
+    )
+    assert res == {"order": {"id": 1}}
+    assert requests == ["POST", "POST"]
+
+
+@pytest.mark.parametrize(
+    ("status", "error"), [(401, AuthError), (400, APIError), (404, APIError)]
+)
+async def test_client_errors_are_mapped(make_client, no_backoff, status, error):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.path)
+        return web.Response(status=status)
+
+    client = await make_client(handler)
+
+    with pytest.raises(error):
+        await client.api_get_calendar()
+    assert len(requests) == 1
+
+
+def test_retry_delay_backs_off_exponentially():
+    resp = SimpleNamespace(status=502, headers={})
+    delays = [
+        TradierAPIAdapter._retry_delay("GET", resp, attempt)
+        for attempt in range(HTTP_MAX_RETRIES + 1)
+    ]
+
+    expected = [HTTP_RETRY_BACKOFF * 2**attempt for attempt in range(HTTP_MAX_RETRIES)]
+    assert delays == [*expected, None]
+
+
+def test_retry_delay_uses_retry_after():
+    resp = SimpleNamespace(status=429, headers={"Retry-After": "7"})
+    assert TradierAPIAdapter._retry_delay("POST", resp, 0) == 7.0
+
+    resp.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert TradierAPIAdapter._retry_delay("POST", resp, 0) == HTTP_RETRY_BACKOFF
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "delay"),
+    [
+        ("3600", HTTP_CALL_TIMEOUT),
+        ("inf", HTTP_CALL_TIMEOUT),
+        ("-5", 0.0),
+        ("nan", HTTP_RETRY_BACKOFF),
+    ],
+)
+def test_retry_after_is_bounded(retry_after, delay):
+    resp = SimpleNamespace(status=429, headers={"Retry-After": retry_after})
+    assert TradierAPIAdapter._retry_delay("GET", resp, 0) == delay
+
+
+############ Query parameters
+
+
+@pytest.fixture
+async def query_client(make_client):
+    """Return an adapter and the list of query strings it sends."""
+
+    queries = []
+
+    async def handler(request):
+        queries.append(dict(request.query))
+        return web.json_response({})
+
+    return await make_client(handler), queries
+
+
+async def test_account_history_params(query_client):
+    client, queries = query_client
+    await client.api_get_account_history(
+        "123",
+        page=2,
+        limit=10,
+        type_="trade",
+        start=date(2024, 1, 2),
+        end=date(2024, 2, 3),
+        exact_match=True,
+    )
+
+    assert queries == [
+        {
+            "account_id": "123",
+            "page": "2",
+            "limit": "10",
+            "type": "trade",
+            "start": "2024-01-02",
+            "end": "2024-02-03",
+            "exact_match": "true",
+        }
+    ]
+
+
+async def test_account_orders_params(query_client):
+    client, queries = query_client
+    await client.api_get_account_orders("123", page=3, include_tags=True)
+    await client.api_get_account_orders("123")
+
+    assert queries == [
+        {"account_id": "123", "page": "3", "includeTags": "true"},
+        {"account_id": "123"},
+    ]
+
+
+async def test_quotes_params(query_client):
+    client, queries = query_client
+    await client.api_get_quotes(["A", "B"], greeks=True)
+    await client.api_get_quotes(["A"])
+
+    assert queries == [
+        {"symbols": "A,B", "greeks": "true"},
+        {"symbols": "A", "greeks": "false"},
+    ]
+
+
+async def test_calendar_params(query_client):
+    client, queries = query_client
+    await client.api_get_calendar()
+    await client.api_get_calendar(month=5)
+    await client.api_get_calendar(month=5, year=2024)
+
+    assert queries == [
+        {},
+        {"month": "5"},
+        {"month": "5", "year": "2024"},
+    ]
+
+
+############ Raw data
+
+
+async def test_raw_data_empty_without_keep_raw(make_client):
+    async def handler(request):
+        return web.json_response({"clock": {"state": "open"}})
+
+    client = await make_client(handler)
+    await client.api_get_clock()
+
+    assert not client.raw_data()
+
+
+async def test_raw_data_is_read_only(make_client):
+    async def handler(request):
+        return web.json_response({"clock": {"state": "open"}})
+
+    client = await make_client(handler, keep_raw=True)
+    await client.api_get_clock()
+    raw = client.raw_data()
+
+    assert list(raw.values()) == [{"clock": {"state": "open"}}]
+    with pytest.raises(TypeError):
+        raw["clock"] = {}  # type: ignore[index]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+async def test_dump_raw(make_client, monkeypatch, tmp_path, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr("aiotradier.tradier_rest.orjson", json)
+        monkeypatch.setattr("aiotradier.tradier_rest._HAS_ORJSON", False)
+
+    async def handler(request):
+        return web.json_response({"clock": {"state": "open"}})
+
+    client = await make_client(handler, keep_raw=True)
+    await client.api_get_clock()
+    path = tmp_path / "raw.json"
+    client.dump_raw(path)
+
+    text = path.read_text()
+    assert json.loads(text) == dict(client.raw_data())
+    assert '\n  "' in text  # indented